@@ -1,76 +1,120 @@
 from collections import defaultdict
 
+try:
+    import polars as pl
+except ImportError:
+    pl = None  # Pure-Python loops are used instead
+
+def _is_frame(transactions):
+    """True for a Polars DataFrame, e.g. the output of File_Handler.validate_and_filter."""
+    return pl is not None and isinstance(transactions, pl.DataFrame)
+
+def _with_amt(df):
+    """Returns the frame with the line amount as column 'amt' (added only if missing)."""
+    if 'amt' in df.columns:
+        return df
+    return df.with_columns((pl.col('Quantity') * pl.col('UnitPrice')).alias('amt'))
+
 # --- Task 2.1: Sales Summary Calculator ---
 
 def calculate_total_revenue(transactions):
     """Calculates total revenue from all transactions."""
+    if _is_frame(transactions):
+        # Same 'amt' column the group-bys aggregate
+        return float(_with_amt(transactions)['amt'].sum())
+
     # Sum of (Quantity * UnitPrice) for all transactions
     return float(sum(tx['Quantity'] * tx['UnitPrice'] for tx in transactions))
 
 def region_wise_sales(transactions):
     """Analyzes sales by region."""
+    if _is_frame(transactions):
+        df = _with_amt(transactions)
+        total_revenue = df['amt'].sum()
+        rows = df.group_by('Region', maintain_order=True).agg([
+            pl.col('amt').sum().alias('total_sales'),
+            pl.len().alias('transaction_count')
+        ]).sort('total_sales', descending=True, maintain_order=True).to_dicts()
+        return {
+            r['Region']: {
+                'total_sales': r['total_sales'],
+                'transaction_count': r['transaction_count'],
+                'percentage': round((r['total_sales'] / total_revenue) * 100, 2)
+            }
+            for r in rows
+        }
+
     total_revenue = calculate_total_revenue(transactions)
-    region_stats = {}
+    region_stats = defaultdict(lambda: [0.0, 0]) # [total_sales, transaction_count]
     
     # Calculate total sales and transaction counts per region
     for tx in transactions:
-        reg = tx['Region']
-        if reg not in region_stats:
-            region_stats[reg] = {'total_sales': 0.0, 'transaction_count': 0}
-        
-        region_stats[reg]['total_sales'] += tx['Quantity'] * tx['UnitPrice']
-        region_stats[reg]['transaction_count'] += 1
-    
-    # Calculate percentage and prepare final dictionary
-    for reg in region_stats:
-        sales = region_stats[reg]['total_sales']
-        region_stats[reg]['percentage'] = round((sales / total_revenue) * 100, 2)
+        stats = region_stats[tx['Region']]
+        stats[0] += tx['Quantity'] * tx['UnitPrice']
+        stats[1] += 1
     
-    # Sort by total_sales in descending order
-    sorted_regions = dict(sorted(region_stats.items(), key=lambda x: x[1]['total_sales'], reverse=True))
+    # Sort by total_sales in descending order, then build the final dictionaries once
+    sorted_regions = {
+        reg: {
+            'total_sales': sales,
+            'transaction_count': count,
+            'percentage': round((sales / total_revenue) * 100, 2)
+        }
+        for reg, (sales, count) in sorted(region_stats.items(), key=lambda x: x[1][0], reverse=True)
+    }
     return sorted_regions
 
-def top_selling_products(transactions, n=5):
-    """Finds top n products by total quantity sold."""
-    product_data = defaultdict(lambda: {'qty': 0, 'rev': 0.0})
+def _product_totals(transactions):
+    """Returns [(ProductName, total_qty, total_rev)] in first-seen order."""
+    if _is_frame(transactions):
+        return _with_amt(transactions).group_by('ProductName', maintain_order=True).agg([
+            pl.col('Quantity').sum(), pl.col('amt').sum()
+        ]).rows()
+
+    product_data = defaultdict(lambda: [0, 0.0]) # [qty, rev]
     
     # Aggregate by ProductName
     for tx in transactions:
-        name = tx['ProductName']
-        product_data[name]['qty'] += tx['Quantity']
-        product_data[name]['rev'] += tx['Quantity'] * tx['UnitPrice']
-        
+        data = product_data[tx['ProductName']]
+        data[0] += tx['Quantity']
+        data[1] += tx['Quantity'] * tx['UnitPrice']
+    return [(name, qty, rev) for name, (qty, rev) in product_data.items()]
+
+def top_selling_products(transactions, n=5):
+    """Finds top n products by total quantity sold."""
     # Sort by TotalQuantity descending
-    sorted_products = sorted(
-        [(name, data['qty'], data['rev']) for name, data in product_data.items()],
-        key=lambda x: x[1],
-        reverse=True
-    )
+    sorted_products = sorted(_product_totals(transactions), key=lambda x: x[1], reverse=True)
     return sorted_products[:n]
 
 # --- Task 2.2: Date-based Analysis ---
 
 def daily_sales_trend(transactions):
     """Analyzes sales trends by date."""
-    daily_data = {}
+    if _is_frame(transactions):
+        rows = _with_amt(transactions).group_by('Date').agg([
+            pl.col('amt').sum().alias('revenue'),
+            pl.len().alias('transaction_count'),
+            pl.col('CustomerID').n_unique().alias('unique_customers')
+        ]).sort('Date').to_dicts()
+        return {r.pop('Date'): r for r in rows}
+
+    daily_data = defaultdict(lambda: [0.0, 0, set()]) # [revenue, transaction_count, customers]
     
     # Group by date and calculate metrics
     for tx in transactions:
-        date = tx['Date']
-        if date not in daily_data:
-            daily_data[date] = {'revenue': 0.0, 'transaction_count': 0, 'customers': set()}
-        
-        daily_data[date]['revenue'] += tx['Quantity'] * tx['UnitPrice']
-        daily_data[date]['transaction_count'] += 1
-        daily_data[date]['customers'].add(tx['CustomerID'])
+        data = daily_data[tx['Date']]
+        data[0] += tx['Quantity'] * tx['UnitPrice']
+        data[1] += 1
+        data[2].add(tx['CustomerID'])
         
     # Format and sort chronologically
     trend = {}
     for date in sorted(daily_data.keys()):
+        revenue, count, customers = daily_data[date]
         trend[date] = {
-            'revenue': daily_data[date]['revenue'],
-            'transaction_count': daily_data[date]['transaction_count'],
-            'unique_customers': len(daily_data[date]['customers'])
+            'revenue': revenue,
+            'transaction_count': count,
+            'unique_customers': len(customers)
         }
     return trend
 
@@ -88,44 +132,46 @@ def find_peak_sales_day(transactions):
 
 def customer_analysis(transactions):
     """Analyzes customer purchase patterns."""
-    cust_data = {}
+    if _is_frame(transactions):
+        rows = _with_amt(transactions).group_by('CustomerID', maintain_order=True).agg([
+            pl.col('amt').sum().alias('total_spent'),
+            pl.len().alias('purchase_count'),
+            pl.col('ProductName').unique().sort().alias('products_bought')
+        ]).sort('total_spent', descending=True, maintain_order=True).to_dicts()
+        return {
+            r['CustomerID']: {
+                'total_spent': r['total_spent'],
+                'purchase_count': r['purchase_count'],
+                'avg_order_value': round(r['total_spent'] / r['purchase_count'], 2),
+                'products_bought': r['products_bought']
+            }
+            for r in rows
+        }
+
+    cust_data = defaultdict(lambda: [0.0, 0, set()]) # [total_spent, purchase_count, products]
     
     for tx in transactions:
-        cid = tx['CustomerID']
-        if cid not in cust_data:
-            cust_data[cid] = {'total_spent': 0.0, 'purchase_count': 0, 'products': set()}
-            
-        cust_data[cid]['total_spent'] += tx['Quantity'] * tx['UnitPrice']
-        cust_data[cid]['purchase_count'] += 1
-        cust_data[cid]['products'].add(tx['ProductName'])
+        data = cust_data[tx['CustomerID']]
+        data[0] += tx['Quantity'] * tx['UnitPrice']
+        data[1] += 1
+        data[2].add(tx['ProductName'])
         
     # Final formatting and sorting by total_spent descending
     result = {}
-    for cid in cust_data:
+    for cid, (spent, count, products) in cust_data.items():
         result[cid] = {
-            'total_spent': cust_data[cid]['total_spent'],
-            'purchase_count': cust_data[cid]['purchase_count'],
-            'avg_order_value': round(cust_data[cid]['total_spent'] / cust_data[cid]['purchase_count'], 2),
-            'products_bought': sorted(list(cust_data[cid]['products']))
+            'total_spent': spent,
+            'purchase_count': count,
+            'avg_order_value': round(spent / count, 2),
+            'products_bought': sorted(list(products))
         }
         
     return dict(sorted(result.items(), key=lambda x: x[1]['total_spent'], reverse=True))
 
 def low_performing_products(transactions, threshold=10):
     """Identifies products with low sales."""
-    product_data = defaultdict(lambda: {'qty': 0, 'rev': 0.0})
-    
-    for tx in transactions:
-        name = tx['ProductName']
-        product_data[name]['qty'] += tx['Quantity']
-        product_data[name]['rev'] += tx['Quantity'] * tx['UnitPrice']
-        
     # Filter products with total quantity < threshold
-    low_perf = [
-        (name, data['qty'], data['rev']) 
-        for name, data in product_data.items() 
-        if data['qty'] < threshold
-    ]
+    low_perf = [row for row in _product_totals(transactions) if row[1] < threshold]
     
     # Sort by TotalQuantity ascending
     return sorted(low_perf, key=lambda x: x[1])
@@ -1,8 +1,36 @@
 import os
+import sys
+import time
+import json
 import requests
-import re
 from collections import defaultdict
 
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = pq = pa_csv = None  # Falls back to the per-line parser / text output
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # stdlib json is used instead
+
+TX_KEYS = ['TransactionID', 'Date', 'ProductID', 'ProductName', 'Quantity', 'UnitPrice', 'CustomerID', 'Region']
+TX_SCHEMA = {
+    'TransactionID': pl.Utf8, 'Date': pl.Utf8, 'ProductID': pl.Utf8, 'ProductName': pl.Utf8,
+    'Quantity': pl.Int64, 'UnitPrice': pl.Float64, 'CustomerID': pl.Utf8, 'Region': pl.Utf8
+} if pl else None
+
+def _is_frame(transactions):
+    """True when transactions are held column-wise in a Polars DataFrame."""
+    return pl is not None and isinstance(transactions, pl.DataFrame)
+
 # ==========================================
 # PART 0: DUMMY DATA SETUP (FOR RUNNING IMMEDIATELY)
 # ==========================================
@@ -26,8 +54,9 @@ def read_sales_data(filename):
     for enc in ['utf-8', 'latin-1', 'cp1252']:
         try:
             with open(filename, 'r', encoding=enc) as file:
-                lines = file.readlines()
-                return [line.strip() for line in lines[1:] if line.strip()] # Skip header
+                next(file, None) # Skip header
+                # Stream lines instead of materializing readlines()
+                return [stripped for line in file if (stripped := line.strip())]
         except FileNotFoundError:
             print(f"Error: {filename} not found.")
             return []
@@ -35,41 +64,80 @@ def read_sales_data(filename):
             continue
     return []
 
+def _parse_transactions_arrow(raw_lines):
+    """Parses all lines in one PyArrow pass, cleans columns with Polars."""
+    table = pa_csv.read_csv(
+        pa.py_buffer('\n'.join(raw_lines).encode('utf-8')),
+        read_options=pa_csv.ReadOptions(column_names=TX_KEYS, block_size=8 << 20),
+        parse_options=pa_csv.ParseOptions(delimiter='|', quote_char=False,
+                                          invalid_row_handler=lambda row: 'skip'), # Skip incorrect field counts
+        convert_options=pa_csv.ConvertOptions(column_types={k: pa.string() for k in TX_KEYS})
+    )
+    df = pl.from_arrow(table).with_columns(
+        pl.col('ProductName').str.replace_all(',', ''), # Handle commas in name
+        pl.col('Quantity').str.strip_chars().str.replace_all(',', '').cast(pl.Int64, strict=False), # int() allows spaces
+        pl.col('UnitPrice').str.strip_chars().str.replace_all(',', '').cast(pl.Float64, strict=False)
+    )
+    # Failed conversions are null; line amount is computed once here
+    return df.drop_nulls(['Quantity', 'UnitPrice']).with_columns((pl.col('Quantity') * pl.col('UnitPrice')).alias('amt'))
+
 def parse_transactions(raw_lines):
-    """Parses raw lines into clean dictionaries."""
+    """Parses raw lines into a Polars frame (or clean dictionaries without polars)."""
+    if pl is not None and pa is not None:
+        return _parse_transactions_arrow(raw_lines) if raw_lines else pl.DataFrame(schema={**TX_SCHEMA, 'amt': pl.Float64})
     parsed = []
     for line in raw_lines:
         parts = line.split('|')
         if len(parts) != 8: continue # Skip incorrect field counts
         try:
+            qty = int(parts[4].replace(',', '')) # Convert to int
+            price = float(parts[5].replace(',', '')) # Convert to float
             parsed.append({
                 'TransactionID': parts[0],
                 'Date': parts[1],
                 'ProductID': parts[2],
                 'ProductName': parts[3].replace(',', ''), # Handle commas in name
-                'Quantity': int(parts[4].replace(',', '')), # Convert to int
-                'UnitPrice': float(parts[5].replace(',', '')), # Convert to float
+                'Quantity': qty,
+                'UnitPrice': price,
                 'CustomerID': parts[6],
-                'Region': parts[7]
+                'Region': parts[7],
+                'amt': qty * price # Line amount, reused downstream
             })
         except ValueError: continue
     return parsed
 
 def validate_and_filter(transactions, region=None, min_amount=None):
     """Validates rules (IDs starting with T/P/C) and filters."""
+    if _is_frame(transactions):
+        # All rules as one boolean mask over the columns
+        valid = transactions.filter(
+            (pl.col('Quantity') > 0) & (pl.col('UnitPrice') > 0) &
+            pl.col('TransactionID').str.starts_with('T') &
+            pl.col('ProductID').str.starts_with('P') &
+            pl.col('CustomerID').str.starts_with('C')
+        )
+        invalid_count = transactions.height - valid.height
+        filtered = valid
+        if region:
+            filtered = filtered.filter(pl.col('Region') == region)
+        if min_amount:
+            filtered = filtered.filter(pl.col('amt') >= min_amount)
+        summary = {'total_input': transactions.height, 'invalid': invalid_count, 'final_count': filtered.height}
+        return filtered, invalid_count, summary
+
     valid, invalid_count = [], 0
     for tx in transactions:
-        # Validation Rules
+        # Validation Rules (ID prefixes compared as the first character)
         if (tx['Quantity'] > 0 and tx['UnitPrice'] > 0 and 
-            tx['TransactionID'].startswith('T') and 
-            tx['ProductID'].startswith('P') and 
-            tx['CustomerID'].startswith('C')):
+            tx['TransactionID'][:1] == 'T' and 
+            tx['ProductID'][:1] == 'P' and 
+            tx['CustomerID'][:1] == 'C'):
             valid.append(tx)
         else:
             invalid_count += 1
             
     filtered = [t for t in valid if (not region or t['Region'] == region) and 
-                (not min_amount or (t['Quantity']*t['UnitPrice']) >= min_amount)]
+                (not min_amount or t['amt'] >= min_amount)]
     
     summary = {'total_input': len(transactions), 'invalid': invalid_count, 'final_count': len(filtered)}
     return filtered, invalid_count, summary
@@ -79,39 +147,90 @@ def validate_and_filter(transactions, region=None, min_amount=None):
 # ==========================================
 def calculate_total_revenue(transactions):
     """Sum of Qty * Price."""
+    if _is_frame(transactions):
+        return float(transactions['amt'].sum())
     return sum(tx['Quantity'] * tx['UnitPrice'] for tx in transactions)
 
 def region_wise_sales(transactions):
     """Stats per region sorted by sales."""
     total_rev = calculate_total_revenue(transactions)
-    stats = defaultdict(lambda: {'total_sales': 0.0, 'transaction_count': 0})
+    if _is_frame(transactions):
+        rows = transactions.group_by('Region', maintain_order=True).agg([
+            pl.col('amt').sum().alias('total_sales'),
+            pl.len().alias('transaction_count')
+        ]).sort('total_sales', descending=True, maintain_order=True).to_dicts()
+        return {r.pop('Region'): {**r, 'percentage': round((r['total_sales'] / total_rev) * 100, 2)} for r in rows}
+    stats = defaultdict(lambda: [0.0, 0]) # [total_sales, transaction_count]
     for tx in transactions:
-        stats[tx['Region']]['total_sales'] += tx['Quantity'] * tx['UnitPrice']
-        stats[tx['Region']]['transaction_count'] += 1
-    for r in stats:
-        stats[r]['percentage'] = round((stats[r]['total_sales'] / total_rev) * 100, 2)
-    return dict(sorted(stats.items(), key=lambda x: x[1]['total_sales'], reverse=True))
+        s = stats[tx['Region']]
+        s[0] += tx['amt']
+        s[1] += 1
+    return {r: {'total_sales': sales, 'transaction_count': count, 'percentage': round((sales / total_rev) * 100, 2)}
+            for r, (sales, count) in sorted(stats.items(), key=lambda x: x[1][0], reverse=True)}
 
 def daily_sales_trend(transactions):
     """Groups stats by date."""
-    trend = defaultdict(lambda: {'revenue': 0.0, 'transaction_count': 0, 'unique_customers': set()})
+    if _is_frame(transactions):
+        rows = transactions.group_by('Date').agg([
+            pl.col('amt').sum().alias('revenue'),
+            pl.len().alias('transaction_count'),
+            pl.col('CustomerID').n_unique().alias('unique_customers')
+        ]).sort('Date').to_dicts()
+        return {r.pop('Date'): r for r in rows}
+    trend = defaultdict(lambda: [0.0, 0, set()]) # [revenue, transaction_count, customers]
     for tx in transactions:
-        d = tx['Date']
-        trend[d]['revenue'] += tx['Quantity'] * tx['UnitPrice']
-        trend[d]['transaction_count'] += 1
-        trend[d]['unique_customers'].add(tx['CustomerID'])
-    return {k: {**v, 'unique_customers': len(v['unique_customers'])} for k in sorted(trend.keys())}
+        t = trend[tx['Date']]
+        t[0] += tx['amt']
+        t[1] += 1
+        t[2].add(tx['CustomerID'])
+    return {k: {'revenue': trend[k][0], 'transaction_count': trend[k][1], 'unique_customers': len(trend[k][2])}
+            for k in sorted(trend.keys())}
 
 # ==========================================
 # PART 3: API INTEGRATION
 # ==========================================
+API_URL = 'https://dummyjson.com/products?limit=100'
+API_CACHE = 'data/api_cache.json'
+API_CACHE_TTL = 3600  # seconds; the product catalog changes rarely
+
+# One pooled session: later calls reuse the TCP/TLS connection
+_SESSION = requests.Session()
+_SESSION.headers.update({'Accept-Encoding': 'gzip, deflate'})
+
+def _decode_json(raw):
+    """Decodes JSON bytes, with orjson when it is installed."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _load_api_cache():
+    """Returns the cached product list if the cache file is fresh, else None."""
+    try:
+        if time.time() - os.path.getmtime(API_CACHE) < API_CACHE_TTL:
+            with open(API_CACHE, 'rb') as f:
+                return _decode_json(f.read())
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache counts as a miss
+    return None
+
+def _save_api_cache(products):
+    """Persists the product list for later runs."""
+    os.makedirs(os.path.dirname(API_CACHE), exist_ok=True)
+    with open(API_CACHE, 'w', encoding='utf-8') as f:
+        json.dump(products, f)
+
 def fetch_all_products():
-    """Fetches product data from DummyJSON API."""
+    """Fetches product data from DummyJSON API (from the disk cache when it is fresh)."""
+    cached = _load_api_cache()
+    if cached:
+        print("API Success: Products loaded from cache.")
+        return cached
     try:
-        response = requests.get('https://dummyjson.com/products?limit=100')
+        response = _SESSION.get(API_URL, timeout=5)
         if response.status_code == 200:
             print("API Success: Products fetched.")
-            return response.json().get('products', [])
+            products = _decode_json(response.content).get('products', [])
+            if products:
+                _save_api_cache(products)
+            return products
     except Exception as e:
         print(f"API Failure: {e}")
     return []
@@ -120,36 +239,76 @@ def create_product_mapping(api_products):
     """Maps numeric ID to product info."""
     return {p['id']: {'category': p['category'], 'brand': p['brand'], 'rating': p['rating']} for p in api_products}
 
+def _enrich_sales_data_polars(transactions, mapping):
+    """Left-joins the API mapping onto the transactions in one columnar pass."""
+    api_df = pl.DataFrame(
+        [{'id': k, 'API_Category': v['category'], 'API_Brand': v['brand'], 'API_Rating': v['rating']}
+         for k, v in mapping.items()],
+        schema={'id': pl.Int64, 'API_Category': pl.Utf8, 'API_Brand': pl.Utf8, 'API_Rating': pl.Float64}
+    ).with_columns(pl.lit(True).alias('API_Match'))
+
+    enriched = (
+        transactions.with_columns(pl.col('ProductID').str.strip_prefix('P').cast(pl.Int64, strict=False).alias('pid_num'))
+        .join(api_df, left_on='pid_num', right_on='id', how='left', maintain_order='left')
+        .with_columns(pl.col('API_Match').fill_null(False))
+        .drop('pid_num')
+    )
+    return enriched
+
 def enrich_sales_data(transactions, mapping):
-    """Adds API data to transactions."""
+    """Adds API data to transactions (a frame stays a frame, a list stays a list)."""
+    if _is_frame(transactions):
+        return _enrich_sales_data_polars(transactions, mapping)
     enriched = []
     for tx in transactions:
-        # Extract numeric ID (e.g., 'P1' -> 1)
-        try:
-            num_id = int(re.search(r'\d+', tx['ProductID']).group())
-            if num_id in mapping:
-                tx.update({
-                    'API_Category': mapping[num_id]['category'],
-                    'API_Brand': mapping[num_id]['brand'],
-                    'API_Rating': mapping[num_id]['rating'],
-                    'API_Match': True
-                })
-            else:
-                tx.update({'API_Category': None, 'API_Brand': None, 'API_Rating': None, 'API_Match': False})
-        except:
-            tx.update({'API_Match': False})
+        # Extract numeric ID (e.g., 'P1' -> 1); IDs are 'P<digits>' so a slice is enough
+        pid = tx['ProductID'][1:]
+        num_id = int(pid) if pid.isdecimal() else None
+        if num_id in mapping:
+            tx.update({
+                'API_Category': mapping[num_id]['category'],
+                'API_Brand': mapping[num_id]['brand'],
+                'API_Rating': mapping[num_id]['rating'],
+                'API_Match': True
+            })
+        else:
+            tx.update({'API_Category': None, 'API_Brand': None, 'API_Rating': None, 'API_Match': False})
         enriched.append(tx)
     return enriched
 
-def save_enriched_data(enriched_transactions, filename='data/enriched_sales_data.txt'):
-    """Saves final data back to pipe-delimited file."""
-    if not enriched_transactions: return
-    headers = list(enriched_transactions[0].keys())
-    with open(filename, 'w') as f:
-        f.write('|'.join(headers) + '\n')
-        for tx in enriched_transactions:
-            f.write('|'.join(str(tx[h]) for h in headers) + '\n')
+def save_enriched_data(enriched_transactions, filename=None, legacy_txt=False):
+    """Saves final data by extension: '.parquet' as Snappy Parquet, anything else as pipe-delimited text."""
+    if len(enriched_transactions) == 0: return
+    drop = {'amt'}  # Parse-time helper column, not part of the saved schema
+    if filename is None:
+        # Default name only; a caller-supplied path is never rewritten
+        ext = '.txt' if legacy_txt or pq is None else '.parquet'
+        filename = 'data/enriched_sales_data' + ext
+    if filename.lower().endswith('.parquet'):
+        if pq is None:
+            print(f"Error: pyarrow is required to write {filename}")
+            return None
+        # Columnar + dictionary encoding keeps Region/Category/Brand small
+        if _is_frame(enriched_transactions):
+            table = enriched_transactions.drop(drop, strict=False).to_arrow()
+        else:
+            table = pa.Table.from_pylist(enriched_transactions)
+            table = table.select([c for c in table.column_names if c not in drop])
+        pq.write_table(table, filename, compression='snappy', use_dictionary=True, row_group_size=100_000)
+    else:
+        if _is_frame(enriched_transactions):
+            out = enriched_transactions.drop(drop, strict=False)
+            headers, rows = out.columns, out.iter_rows()
+        else:
+            headers = [h for h in enriched_transactions[0] if h not in drop]
+            rows = ([tx[h] for h in headers] for tx in enriched_transactions)
+        # Join the whole file in memory, then a single write
+        lines = ['|'.join(headers)]
+        lines.extend('|'.join(str(v) for v in row) for row in rows)
+        with open(filename, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
     print(f"Saved enriched data to {filename}")
+    return filename
 
 # ==========================================
 # MAIN EXECUTION
@@ -172,5 +331,5 @@ if __name__ == "__main__":
     if api_data:
         mapping = create_product_mapping(api_data)
         enriched = enrich_sales_data(valid_data, mapping)
-        save_enriched_data(enriched)
-        print("\nProcess Complete. Check 'data/enriched_sales_data.txt' for results.")
\ No newline at end of file
+        saved_path = save_enriched_data(enriched, legacy_txt='--legacy-txt' in sys.argv)
+        print(f"\nProcess Complete. Check '{saved_path}' for results.")
\ No newline at end of file
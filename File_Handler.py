@@ -1,5 +1,12 @@
 import os
 
+try:
+    import polars as pl
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pl = pa = pa_csv = None  # Falls back to the per-line parser
+
 # --- PART 1.1: READ SALES DATA ---
 def read_sales_data(filename):
     """
@@ -15,9 +22,9 @@ def read_sales_data(filename):
     for encoding in encodings:
         try:
             with open(filename, 'r', encoding=encoding) as file:
-                lines = file.readlines()
-                # Skip header, remove empty lines and whitespace
-                raw_lines = [line.strip() for line in lines[1:] if line.strip()]
+                next(file, None) # Skip header
+                # Stream the file line by line (no readlines() copy), remove empty lines and whitespace
+                raw_lines = [stripped for line in file if (stripped := line.strip())]
             break # If successful, stop trying encodings
         except (UnicodeDecodeError, Exception):
             continue
@@ -25,12 +32,40 @@ def read_sales_data(filename):
     return raw_lines
 
 # --- PART 1.2: PARSE AND CLEAN DATA ---
+def _parse_transactions_arrow(raw_lines, keys):
+    """
+    Parses all lines in one PyArrow pass and cleans the columns with Polars.
+    """
+    table = pa_csv.read_csv(
+        pa.py_buffer('\n'.join(raw_lines).encode('utf-8')),
+        read_options=pa_csv.ReadOptions(column_names=keys, block_size=8 << 20),
+        # Plain split on '|': no quoting, skip rows with incorrect number of fields
+        parse_options=pa_csv.ParseOptions(delimiter='|', quote_char=False,
+                                          invalid_row_handler=lambda row: 'skip'),
+        convert_options=pa_csv.ConvertOptions(column_types={k: pa.string() for k in keys})
+    )
+
+    df = pl.from_arrow(table).with_columns(
+        pl.col('ProductName').str.replace_all(',', ''),
+        # strip_chars first: int()/float() in the line parser accept surrounding spaces too
+        pl.col('Quantity').str.strip_chars().str.replace_all(',', '').cast(pl.Int64, strict=False),
+        pl.col('UnitPrice').str.strip_chars().str.replace_all(',', '').cast(pl.Float64, strict=False)
+    )
+    # Failed conversions become null; drop those rows. Line amount is computed once here.
+    return df.drop_nulls(['Quantity', 'UnitPrice']).with_columns(
+        (pl.col('Quantity') * pl.col('UnitPrice')).alias('amt')
+    )
+
 def parse_transactions(raw_lines):
     """
-    Parses raw pipe-delimited lines into a clean list of dictionaries.
+    Parses raw pipe-delimited lines into a clean list of dictionaries
+    (a Polars DataFrame when polars/pyarrow are installed).
     """
     parsed_data = []
     keys = ['TransactionID', 'Date', 'ProductID', 'ProductName', 'Quantity', 'UnitPrice', 'CustomerID', 'Region']
+
+    if pl is not None and raw_lines:
+        return _parse_transactions_arrow(raw_lines, keys)
     
     for line in raw_lines:
         # Split by pipe delimiter
@@ -49,15 +84,18 @@ def parse_transactions(raw_lines):
             price_str = parts[5].replace(',', '')
             
             # Convert types
+            quantity = int(qty_str)
+            unit_price = float(price_str)
             transaction = {
                 'TransactionID': parts[0],
                 'Date': parts[1],
                 'ProductID': parts[2],
                 'ProductName': product_name,
-                'Quantity': int(qty_str),
-                'UnitPrice': float(price_str),
+                'Quantity': quantity,
+                'UnitPrice': unit_price,
                 'CustomerID': parts[6],
-                'Region': parts[7]
+                'Region': parts[7],
+                'amt': quantity * unit_price # Line amount, reused by every filter/aggregator
             }
             parsed_data.append(transaction)
         except ValueError:
@@ -66,10 +104,61 @@ def parse_transactions(raw_lines):
     return parsed_data
 
 # --- PART 1.3: DATA VALIDATION AND FILTERING ---
+def _validate_and_filter_polars(transactions, region, min_amount, max_amount):
+    """
+    Columnar validate_and_filter: every rule is one vectorized boolean mask.
+    """
+    amount = pl.col('amt')
+
+    # 1. Validation Logic (all rules &-reduced, no per-row branching)
+    valid_mask = (
+        (pl.col('Quantity') > 0) & (pl.col('UnitPrice') > 0) &
+        pl.all_horizontal(pl.col(pl.String).str.len_chars() > 0) &  # All required fields present
+        pl.col('TransactionID').str.starts_with('T') &
+        pl.col('ProductID').str.starts_with('P') &
+        pl.col('CustomerID').str.starts_with('C')
+    )
+    valid_transactions = transactions.filter(valid_mask)
+    invalid_count = transactions.height - valid_transactions.height
+
+    # 2. Display Info before filtering
+    available_regions = sorted(valid_transactions['Region'].unique().to_list())
+    print(f"Available Regions: {available_regions}")
+    if valid_transactions.height:
+        lo, hi = valid_transactions.select(amount.min().alias('min'), amount.max().alias('max')).row(0)
+        print(f"Transaction Amount Range: Min: {lo}, Max: {hi}")
+
+    # 3. Filtering Logic
+    filtered_list = valid_transactions
+    if region:
+        filtered_list = filtered_list.filter(pl.col('Region') == region)
+        print(f"Records after region filter: {filtered_list.height}")
+
+    if min_amount is not None or max_amount is not None:
+        if min_amount is not None:
+            filtered_list = filtered_list.filter(amount >= min_amount)
+        if max_amount is not None:
+            filtered_list = filtered_list.filter(amount <= max_amount)
+        print(f"Records after amount filter: {filtered_list.height}")
+
+    summary = {
+        'total_input': transactions.height,
+        'invalid': invalid_count,
+        'filtered_by_region': valid_transactions.filter(pl.col('Region') != region).height if region else 0,
+        'filtered_by_amount': 0, # Calculated based on requirements
+        'final_count': filtered_list.height
+    }
+
+    return filtered_list, invalid_count, summary
+
 def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
     """
     Validates transactions and applies optional filters.
+    Returns the same container type it is given (list of dicts or Polars DataFrame).
     """
+    if pl is not None and isinstance(transactions, pl.DataFrame):
+        return _validate_and_filter_polars(transactions, region, min_amount, max_amount)
+
     valid_transactions = []
     invalid_count = 0
     total_input = len(transactions)
@@ -83,11 +172,12 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
             is_valid = False
         elif not all(tx.values()): # All required fields present
             is_valid = False
-        elif not tx['TransactionID'].startswith('T'):
+        # ID prefixes: compare the first character directly (no str.startswith call)
+        elif tx['TransactionID'][:1] != 'T':
             is_valid = False
-        elif not tx['ProductID'].startswith('P'):
+        elif tx['ProductID'][:1] != 'P':
             is_valid = False
-        elif not tx['CustomerID'].startswith('C'):
+        elif tx['CustomerID'][:1] != 'C':
             is_valid = False
             
         if is_valid:
@@ -97,11 +187,17 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
 
     # 2. Display Info before filtering
     available_regions = sorted(list(set(t['Region'] for t in valid_transactions)))
-    amounts = [t['Quantity'] * t['UnitPrice'] for t in valid_transactions]
     
     print(f"Available Regions: {available_regions}")
-    if amounts:
-        print(f"Transaction Amount Range: Min: {min(amounts)}, Max: {max(amounts)}")
+    if valid_transactions:
+        # Single pass for both ends of the range (no amounts list, no second scan)
+        lo = hi = valid_transactions[0]['amt']
+        for t in valid_transactions:
+            if t['amt'] < lo:
+                lo = t['amt']
+            elif t['amt'] > hi:
+                hi = t['amt']
+        print(f"Transaction Amount Range: Min: {lo}, Max: {hi}")
     
     # 3. Filtering Logic
     filtered_list = valid_transactions
@@ -116,7 +212,7 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     if min_amount is not None or max_amount is not None:
         final_filtered = []
         for t in filtered_list:
-            total = t['Quantity'] * t['UnitPrice']
+            total = t['amt']
             if (min_amount is None or total >= min_amount) and \
                (max_amount is None or total <= max_amount):
                 final_filtered.append(t)
@@ -2,8 +2,10 @@ import os
 import sys
 import subprocess
 import datetime
+import time
+import json
 import csv
-import re
+from concurrent.futures import ThreadPoolExecutor
 from collections import defaultdict
 
 # --- AUTO-INSTALLER FOR THE 'REQUESTS' LIBRARY ---
@@ -14,12 +16,86 @@ except ImportError:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "requests"])
     import requests
 
+# --- OPTIONAL: POLARS FOR COLUMNAR AGGREGATION ---
+try:
+    import polars as pl
+except ImportError:
+    pl = None  # Falls back to the pure-Python loops below
+
+# --- OPTIONAL: PYARROW FOR VECTORIZED CSV PARSING ---
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
+
+# --- OPTIONAL: ORJSON FOR FASTER API DECODING ---
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+TX_SCHEMA = {
+    'TransactionID': pl.Utf8, 'Date': pl.Utf8, 'ProductID': pl.Utf8, 'ProductName': pl.Utf8,
+    'Quantity': pl.Int64, 'UnitPrice': pl.Float64, 'CustomerID': pl.Utf8, 'Region': pl.Utf8
+} if pl else None
+
+def _is_frame(transactions):
+    """True when transactions are held column-wise in a Polars DataFrame."""
+    return pl is not None and isinstance(transactions, pl.DataFrame)
+
 # ==========================================
 # PART 1: DATA PROCESSING FUNCTIONS
 # ==========================================
 
+def _ragged_row(row):
+    """Arrow invalid_row_handler: skip short rows, reject rows with extra fields."""
+    # DictReader kept extra-field rows (extras under restkey); Arrow can only drop them,
+    # so raise and let read_and_parse re-read the file with csv.reader instead
+    return 'error' if row.actual_columns > row.expected_columns else 'skip'
+
+def _read_and_parse_arrow(filename):
+    """Parses the whole file in C++ (PyArrow) and cleans it column-wise (Polars)."""
+    with open(filename, 'rb') as f:
+        raw = f.read()
+
+    # Decode check once instead of re-reading the file per encoding
+    try:
+        raw.decode('utf-8')
+        encoding = 'utf8'
+    except UnicodeDecodeError:
+        encoding = 'latin-1'
+
+    # Detect delimiter (comma for .csv, pipe for .txt)
+    delimiter = csv.Sniffer().sniff(raw[:1024].decode(encoding, errors='ignore')).delimiter
+    table = pa_csv.read_csv(
+        pa.py_buffer(raw),
+        read_options=pa_csv.ReadOptions(block_size=8 << 20, encoding=encoding),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter, invalid_row_handler=_ragged_row),
+        # Read everything as text so '1,500' / '₹' can be cleaned before casting
+        convert_options=pa_csv.ConvertOptions(
+            column_types={col: pa.string() for col in TX_SCHEMA},
+            include_columns=list(TX_SCHEMA)
+        )
+    )
+
+    df = pl.from_arrow(table).with_columns(pl.all().str.strip_chars())
+    df = df.with_columns(
+        pl.col('ProductName').str.replace_all(',', ''),
+        pl.col('Quantity').str.replace_all(',', '').cast(pl.Float64).cast(pl.Int64),
+        pl.col('UnitPrice').str.replace_all('[,₹]', '').cast(pl.Float64)
+    )
+    # Line amount is computed once here and reused by every later step
+    return df.with_columns((pl.col('Quantity') * pl.col('UnitPrice')).alias('amt'))
+
 def read_and_parse(filename):
     """Reads CSV/TXT, handles encoding, and cleans data."""
+    if pa is not None and pl is not None:
+        try:
+            return _read_and_parse_arrow(filename)
+        except Exception:
+            pass  # Fall back to the csv.reader path below
+
     data = []
     encodings = ['utf-8', 'latin-1', 'cp1252']
     
@@ -29,21 +105,32 @@ def read_and_parse(filename):
                 # Detect delimiter (comma for .csv, pipe for .txt)
                 dialect = csv.Sniffer().sniff(f.read(1024))
                 f.seek(0)
-                reader = csv.DictReader(f, dialect=dialect)
+                # Plain csv.reader + column positions: no per-row dict from DictReader
+                reader = csv.reader(f, dialect=dialect)
+                idx = {name: i for i, name in enumerate(next(reader))}
+                i_tid, i_date, i_pid, i_name, i_qty, i_price, i_cid, i_reg = (
+                    idx[col] for col in ('TransactionID', 'Date', 'ProductID', 'ProductName',
+                                         'Quantity', 'UnitPrice', 'CustomerID', 'Region')
+                )
                 for row in reader:
+                    if len(row) < len(idx):
+                        continue  # Blank or short line (skipped by the Arrow path too)
                     # Clean numeric values (remove commas, currency symbols)
-                    qty_str = str(row['Quantity']).replace(',', '')
-                    price_str = str(row['UnitPrice']).replace(',', '').replace('₹', '')
+                    qty_str = row[i_qty].replace(',', '')
+                    price_str = row[i_price].replace(',', '').replace('₹', '')
+                    qty = int(float(qty_str))
+                    price = float(price_str)
                     
                     data.append({
-                        'TransactionID': row['TransactionID'].strip(),
-                        'Date': row['Date'].strip(),
-                        'ProductID': row['ProductID'].strip(),
-                        'ProductName': row['ProductName'].strip().replace(',', ''),
-                        'Quantity': int(float(qty_str)),
-                        'UnitPrice': float(price_str),
-                        'CustomerID': row['CustomerID'].strip(),
-                        'Region': row['Region'].strip()
+                        'TransactionID': row[i_tid].strip(),
+                        'Date': row[i_date].strip(),
+                        'ProductID': row[i_pid].strip(),
+                        'ProductName': row[i_name].strip().replace(',', ''),
+                        'Quantity': qty,
+                        'UnitPrice': price,
+                        'CustomerID': row[i_cid].strip(),
+                        'Region': row[i_reg].strip(),
+                        'amt': qty * price
                     })
                 return data
         except Exception:
@@ -52,13 +139,23 @@ def read_and_parse(filename):
 
 def validate_transactions(transactions):
     """Applies strict validation rules."""
+    if _is_frame(transactions):
+        # Same rules as one vectorized mask: no per-row branching
+        valid = transactions.filter(
+            (pl.col('Quantity') > 0) & (pl.col('UnitPrice') > 0) &
+            pl.col('TransactionID').str.starts_with('T') &
+            pl.col('ProductID').str.starts_with('P') &
+            pl.col('CustomerID').str.starts_with('C')
+        )
+        return valid, transactions.height - valid.height
+
     valid, invalid_count = [], 0
     for tx in transactions:
-        # Rule: Qty > 0, Price > 0, Correct ID starts
+        # Rule: Qty > 0, Price > 0, Correct ID starts (checked on the first character)
         if (tx['Quantity'] > 0 and tx['UnitPrice'] > 0 and 
-            tx['TransactionID'].startswith('T') and 
-            tx['ProductID'].startswith('P') and 
-            tx['CustomerID'].startswith('C')):
+            tx['TransactionID'][:1] == 'T' and 
+            tx['ProductID'][:1] == 'P' and 
+            tx['CustomerID'][:1] == 'C'):
             valid.append(tx)
         else:
             invalid_count += 1
@@ -68,38 +165,178 @@ def validate_transactions(transactions):
 # PART 2: ANALYSIS & API
 # ==========================================
 
+def _rows_by_key(frame, key):
+    """Converts a grouped Polars frame into {key: {metric: value}}."""
+    return {row.pop(key): row for row in frame.to_dicts()}
+
+def _perform_analysis_polars(transactions):
+    """Computes every metric as one lazy plan collected in a single collect_all."""
+    lf = transactions.lazy()
+    if 'amt' not in transactions.columns:
+        lf = lf.with_columns((pl.col('Quantity') * pl.col('UnitPrice')).alias('amt'))
+
+    # collect_all shares the common subplan (scan + amt) across all five aggregations
+    total, regions, products, customers, daily = pl.collect_all([
+        lf.select(pl.col('amt').sum()),
+        lf.group_by('Region', maintain_order=True).agg([
+            pl.col('amt').sum().alias('sales'), pl.len().alias('count')
+        ]),
+        lf.group_by('ProductName', maintain_order=True).agg([
+            pl.col('Quantity').sum().alias('qty'), pl.col('amt').sum().alias('rev')
+        ]),
+        lf.group_by('CustomerID', maintain_order=True).agg([
+            pl.col('amt').sum().alias('spent'), pl.len().alias('count')
+        ]),
+        lf.group_by('Date', maintain_order=True).agg([
+            pl.col('amt').sum().alias('rev'),
+            pl.len().alias('tx'),
+            pl.col('CustomerID').unique().alias('cust')
+        ])
+    ])
+
+    daily = _rows_by_key(daily, 'Date')
+    for d in daily.values():
+        d['cust'] = set(d['cust'])
+
+    return {
+        'total_revenue': total.item(),
+        'regions': _rows_by_key(regions, 'Region'),
+        'products': _rows_by_key(products, 'ProductName'),
+        'customers': _rows_by_key(customers, 'CustomerID'),
+        'daily': daily
+    }
+
 def perform_analysis(transactions):
     """Calculates all metrics for the report."""
-    analysis = {
-        'total_revenue': sum(t['Quantity'] * t['UnitPrice'] for t in transactions),
-        'regions': defaultdict(lambda: {'sales': 0.0, 'count': 0}),
-        'products': defaultdict(lambda: {'qty': 0, 'rev': 0.0}),
-        'customers': defaultdict(lambda: {'spent': 0.0, 'count': 0}),
-        'daily': defaultdict(lambda: {'rev': 0.0, 'tx': 0, 'cust': set()})
-    }
+    if _is_frame(transactions):
+        return _perform_analysis_polars(transactions)
+
+    # Positional accumulators: one small list per group, no per-increment key hashing
+    regions = defaultdict(lambda: [0.0, 0])          # [sales, count]
+    products = defaultdict(lambda: [0, 0.0])         # [qty, rev]
+    customers = defaultdict(lambda: [0.0, 0])        # [spent, count]
+    daily = defaultdict(lambda: [0.0, 0, set()])     # [rev, tx, cust]
     
     for t in transactions:
-        amt = t['Quantity'] * t['UnitPrice']
-        analysis['regions'][t['Region']]['sales'] += amt
-        analysis['regions'][t['Region']]['count'] += 1
-        analysis['products'][t['ProductName']]['qty'] += t['Quantity']
-        analysis['products'][t['ProductName']]['rev'] += amt
-        analysis['customers'][t['CustomerID']]['spent'] += amt
-        analysis['customers'][t['CustomerID']]['count'] += 1
-        analysis['daily'][t['Date']]['rev'] += amt
-        analysis['daily'][t['Date']]['tx'] += 1
-        analysis['daily'][t['Date']]['cust'].add(t['CustomerID'])
+        amt = t['amt']
+        r = regions[t['Region']]
+        r[0] += amt
+        r[1] += 1
+        p = products[t['ProductName']]
+        p[0] += t['Quantity']
+        p[1] += amt
+        c = customers[t['CustomerID']]
+        c[0] += amt
+        c[1] += 1
+        d = daily[t['Date']]
+        d[0] += amt
+        d[1] += 1
+        d[2].add(t['CustomerID'])
         
-    return analysis
+    return {
+        'total_revenue': sum(t['amt'] for t in transactions),
+        'regions': {k: {'sales': v[0], 'count': v[1]} for k, v in regions.items()},
+        'products': {k: {'qty': v[0], 'rev': v[1]} for k, v in products.items()},
+        'customers': {k: {'spent': v[0], 'count': v[1]} for k, v in customers.items()},
+        'daily': {k: {'rev': v[0], 'tx': v[1], 'cust': v[2]} for k, v in daily.items()}
+    }
+
+def amount_range(transactions):
+    """Returns (min, max) of the precomputed line amounts."""
+    if _is_frame(transactions):
+        return transactions.select(pl.col('amt').min().alias('min'), pl.col('amt').max().alias('max')).row(0)
+    if not transactions:
+        raise ValueError("amount_range() arg is an empty sequence")
+    # One fused pass instead of separate min() and max() scans over a temporary list
+    lo = hi = transactions[0]['amt']
+    for t in transactions:
+        a = t['amt']
+        if a < lo:
+            lo = a
+        elif a > hi:
+            hi = a
+    return lo, hi
+
+def list_regions(transactions):
+    """Returns the sorted distinct regions."""
+    if _is_frame(transactions):
+        return sorted(transactions['Region'].unique().to_list())
+    return sorted(list(set(t['Region'] for t in transactions)))
+
+def filter_by_region(transactions, region):
+    """Keeps only transactions from the given region."""
+    if _is_frame(transactions):
+        return transactions.filter(pl.col('Region') == region)
+    return [t for t in transactions if t['Region'] == region]
+
+API_URL = 'https://dummyjson.com/products?limit=100'
+API_CACHE = 'data/api_cache.json'
+API_CACHE_TTL = 3600  # seconds; the product catalog changes rarely
+
+# One pooled session: later calls reuse the TCP/TLS connection
+_SESSION = requests.Session()
+_SESSION.headers.update({'Accept-Encoding': 'gzip, deflate'})
+
+def _decode_json(raw):
+    """Decodes JSON bytes, with orjson when it is installed."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _load_api_cache():
+    """Returns the cached product list if the cache file is fresh, else None."""
+    try:
+        if time.time() - os.path.getmtime(API_CACHE) < API_CACHE_TTL:
+            with open(API_CACHE, 'rb') as f:
+                return _decode_json(f.read())
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache counts as a miss
+    return None
+
+def _save_api_cache(products):
+    """Persists the product list for later runs."""
+    os.makedirs(os.path.dirname(API_CACHE), exist_ok=True)
+    with open(API_CACHE, 'w', encoding='utf-8') as f:
+        json.dump(products, f)
 
 def fetch_api_products():
-    """Fetches product enrichment data."""
+    """Fetches product enrichment data (from the disk cache when it is fresh)."""
     try:
-        resp = requests.get('https://dummyjson.com/products?limit=100', timeout=5)
-        return {p['id']: p for p in resp.json().get('products', [])}
+        products = _load_api_cache()
+        if products is None:
+            resp = _SESSION.get(API_URL, timeout=5)
+            products = _decode_json(resp.content).get('products', [])
+            if products:
+                _save_api_cache(products)
+        return {p['id']: p for p in products}
     except:
         return {}
 
+def enrich_transactions(transactions, api_data):
+    """Adds API_Category to matched transactions; returns (data, enriched_count, failed_products)."""
+    if _is_frame(transactions):
+        api_df = pl.DataFrame(
+            [{'id': k, 'API_Category': p['category']} for k, p in api_data.items()],
+            schema={'id': pl.Int64, 'API_Category': pl.Utf8}
+        )
+        enriched = transactions.with_columns(
+            pl.col('ProductID').str.strip_prefix('P').cast(pl.Int64, strict=False).alias('pid_num')
+        ).join(api_df, left_on='pid_num', right_on='id', how='left', maintain_order='left').drop('pid_num')
+        matched = enriched['API_Category'].is_not_null()
+        failed_prods = set(enriched.filter(~matched)['ProductName'].to_list())
+        return enriched, int(matched.sum()), failed_prods
+
+    enriched_count = 0
+    failed_prods = set()
+    for t in transactions:
+        # ProductID is always 'P<digits>', so slice instead of a regex match
+        pid = t['ProductID'][1:]
+        num_id = int(pid) if pid.isdecimal() else None
+        if num_id in api_data:
+            t['API_Category'] = api_data[num_id]['category']
+            enriched_count += 1
+        else:
+            failed_prods.add(t['ProductName'])
+    return transactions, enriched_count, failed_prods
+
 # ==========================================
 # PART 3: MAIN WORKFLOW
 # ==========================================
@@ -110,6 +347,10 @@ def main():
         print("         SALES ANALYTICS SYSTEM")
         print("="*40)
 
+        # Network-bound and independent of the CSV: start it now so it overlaps steps 1-8
+        api_pool = ThreadPoolExecutor(max_workers=1)
+        api_future = api_pool.submit(fetch_api_products)
+
         # 1 & 2. Read and Parse
         print("\n[1/10] Reading sales data...")
         filename = 'cleaned_sales_data.csv'
@@ -121,18 +362,18 @@ def main():
         print(f"✓ Parsed {len(raw_data)} records")
 
         # 4 & 5. Filtering
-        regions = sorted(list(set(t['Region'] for t in raw_data)))
-        amounts = [t['Quantity'] * t['UnitPrice'] for t in raw_data]
+        regions = list_regions(raw_data)
+        min_amt, max_amt = amount_range(raw_data)
         
         print(f"\n[3/10] Filter Options Available:")
         print(f"Regions: {', '.join(regions)}")
-        print(f"Amount Range: ₹{min(amounts):,.0f} - ₹{max(amounts):,.0f}")
+        print(f"Amount Range: ₹{min_amt:,.0f} - ₹{max_amt:,.0f}")
         
         do_filter = input("\nDo you want to filter data? (y/n): ").lower()
         working_data = raw_data
         if do_filter == 'y':
             reg_choice = input(f"Enter Region: ")
-            working_data = [t for t in raw_data if t['Region'] == reg_choice]
+            working_data = filter_by_region(raw_data, reg_choice)
             print(f"✓ Filtered to {len(working_data)} records.")
 
         # 6 & 7. Validation
@@ -147,41 +388,46 @@ def main():
 
         # 9. API Fetch
         print("\n[6/10] Fetching product data from API...")
-        api_data = fetch_api_products()
+        api_data = api_future.result()
+        api_pool.shutdown()
         print(f"✓ Fetched {len(api_data)} products")
 
         # 10. Enrichment
         print("\n[7/10] Enriching sales data...")
-        enriched_count = 0
-        failed_prods = set()
-        for t in valid_data:
-            match = re.search(r'\d+', t['ProductID'])
-            if match and int(match.group()) in api_data:
-                t['API_Category'] = api_data[int(match.group())]['category']
-                enriched_count += 1
-            else:
-                failed_prods.add(t['ProductName'])
+        valid_data, enriched_count, failed_prods = enrich_transactions(valid_data, api_data)
         print(f"✓ Enriched {enriched_count}/{len(valid_data)} transactions ({(enriched_count/len(valid_data)*100):.1f}%)")
 
         # 11. Save Enriched
         print("\n[8/10] Saving enriched data...")
         os.makedirs('data', exist_ok=True)
         with open('data/enriched_sales_data.txt', 'w', encoding='utf-8') as f:
-            f.write("|".join(valid_data[0].keys()) + "\n")
-            for t in valid_data: f.write("|".join(str(v) for v in t.values()) + "\n")
+            # 'amt' is only a working column; the file keeps the original schema
+            if _is_frame(valid_data):
+                out = valid_data.drop('amt', strict=False)
+                header, rows = out.columns, out.iter_rows()
+            else:
+                header = [k for k in valid_data[0] if k != 'amt']
+                rows = ((v for k, v in t.items() if k != 'amt') for t in valid_data)
+            # Build the whole body first and hand it to the OS in one write
+            lines = ["|".join(header)]
+            lines.extend("|".join(str(v) for v in row) for row in rows)
+            f.write("\n".join(lines) + "\n")
         print("✓ Saved to: data/enriched_sales_data.txt")
 
         # 12. Report
         print("\n[9/10] Generating report...")
         os.makedirs('output', exist_ok=True)
         report_path = 'output/sales_report.txt'
+        lines = [
+            "="*45 + "\n    SALES ANALYTICS REPORT\n" + "="*45 + "\n",
+            f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"Total Revenue: ₹{metrics['total_revenue']:,.2f}\n",
+            "\nREGION PERFORMANCE:\n"
+        ]
+        lines.extend(f"{r:<10}: ₹{s['sales']:,.0f}\n"
+                     for r, s in sorted(metrics['regions'].items(), key=lambda x: x[1]['sales'], reverse=True))
         with open(report_path, 'w', encoding='utf-8') as f:
-            f.write("="*45 + "\n    SALES ANALYTICS REPORT\n" + "="*45 + "\n")
-            f.write(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Total Revenue: ₹{metrics['total_revenue']:,.2f}\n")
-            f.write("\nREGION PERFORMANCE:\n")
-            for r, s in sorted(metrics['regions'].items(), key=lambda x: x[1]['sales'], reverse=True):
-                f.write(f"{r:<10}: ₹{s['sales']:,.0f}\n")
+            f.write(''.join(lines))
         print(f"✓ Report saved to: {report_path}")
 
         print("\n[10/10] Process Complete!")